@@ -0,0 +1,87 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud_async, pagination, schemas, serialization
+from app.cache import contact_cache, contact_list_response, contact_response
+from app.database import AsyncSessionLocal
+
+# Ті самі ендпоінти контактів, але на AsyncSession (підключається з префіксом /async при DB_ASYNC=1)
+router = APIRouter(tags=["async"])
+
+
+# Dependency для async-сесії
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@router.post("/contacts/", response_model=schemas.ContactOut)
+async def create_contact(contact: schemas.ContactCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud_async.create_contact(db, contact)
+
+
+@router.get("/contacts/{contact_id}", response_model=schemas.ContactOut)
+async def read_contact(contact_id: int, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db)):
+    generation = contact_cache.generation()
+    entry = contact_cache.get_contact(contact_id)
+    if entry is None:
+        contact = await crud_async.get_contact(db, contact_id)
+        if not contact:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        entry = contact_cache.set_contact(contact, generation)
+    return contact_response(entry, if_none_match)
+
+
+@router.get("/contacts/", response_model=list[schemas.ContactOut])
+async def read_contacts(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: Literal["id", "name"] = "id",
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    columns = serialization.parse_fields(fields)
+    params = {"skip": skip, "limit": limit, "cursor": cursor, "sort": sort, "fields": ",".join(columns)}
+    generation = contact_cache.generation()
+    entry = contact_cache.get_list(params)
+    if entry is None:
+        after = pagination.decode_cursor(sort, cursor) if cursor else None
+        rows = await crud_async.get_contact_rows(db, columns, sort=sort, skip=skip, limit=limit, after=after)
+        next_cursor = None
+        if rows and len(rows) == limit:
+            next_cursor = pagination.encode_cursor(sort, rows[-1])
+        entry = contact_cache.set_list(params, serialization.dump_rows(columns, rows), next_cursor, generation)
+    return contact_list_response(entry)
+
+
+@router.put("/contacts/{contact_id}", response_model=schemas.ContactOut)
+async def update_contact(contact_id: int, contact: schemas.ContactCreate, db: AsyncSession = Depends(get_async_db)):
+    db_contact = await crud_async.update_contact_full(db, contact_id, contact)
+    if not db_contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return db_contact
+
+
+@router.patch("/contacts/{contact_id}", response_model=schemas.ContactOut)
+async def update_contact_partial(contact_id: int, contact: schemas.ContactUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_contact = await crud_async.update_contact_partial(db, contact_id, contact)
+    if not db_contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return db_contact
+
+
+@router.delete("/contacts/{contact_id}")
+async def delete_contact(contact_id: int, db: AsyncSession = Depends(get_async_db)):
+    deleted = await crud_async.delete_contact(db, contact_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return {"message": f"Contact {contact_id} deleted successfully"}
+
+
+@router.get("/birthdays/", response_model=list[schemas.ContactOut])
+@router.get("/birthdays/next7", response_model=list[schemas.ContactOut])
+async def upcoming_birthdays(days: int = Query(7, ge=0, le=366), db: AsyncSession = Depends(get_async_db)):
+    return await crud_async.contacts_with_birthdays_next_days(db, days=days)
@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+import tempfile
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.cache import contact_cache
+
+
+# Після цього розміру тимчасові файли (завантаження, звіт) переїжджають з пам'яті на диск
+SPOOL_MAX_SIZE = 1024 * 1024
+
+UPSERT_DIALECTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+# Позначка рядка з байтами, що не декодуються як UTF-8
+INVALID_UTF8 = object()
+
+
+def spooled_file():
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+
+def _text(upload, **kwargs):
+    # utf-8-sig прибирає BOM (Excel); неправильні байти не зупиняють імпорт, а позначають рядок як invalid
+    return io.TextIOWrapper(upload, encoding="utf-8-sig", errors="surrogateescape", **kwargs)
+
+
+def _is_valid_utf8(text: str):
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _read_ndjson(upload):
+    for row_number, line in enumerate(_text(upload), start=1):
+        if not line.strip():
+            continue
+        if not _is_valid_utf8(line):
+            yield row_number, INVALID_UTF8
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except ValueError:
+            yield row_number, None
+
+
+def _read_csv(upload):
+    reader = csv.DictReader(_text(upload, newline=""))
+    for row_number, row in enumerate(reader, start=1):
+        if not all(_is_valid_utf8(value) for value in row.values() if isinstance(value, str)):
+            yield row_number, INVALID_UTF8
+            continue
+        # порожні комірки CSV — це відсутні значення
+        yield row_number, {key: value for key, value in row.items() if key and value != ""}
+
+
+class BulkImporter:
+    """Імпорт контактів пачками: multi-row INSERT ... ON CONFLICT (email) DO UPDATE.
+
+    Існуючий контакт оновлюється лише полями, які є в рядку імпорту (як PATCH); рядки з однаковим
+    набором полів записуються одним запитом.
+    """
+
+    def __init__(self, db: Session, report, batch_size: int = 500):
+        self.db = db
+        self.report = report
+        self.batch_size = batch_size
+        self.batch = []
+        self.batch_keys = set()
+        self.stats = {"total": 0, "created": 0, "updated": 0, "invalid": 0, "failed": 0}
+
+        self.insert = UPSERT_DIALECTS[db.get_bind().dialect.name](models.Contact.__table__)
+        self.upserts = {}
+
+    def _upsert_statement(self, columns):
+        """Upsert, що при конфлікті перезаписує лише `columns` (для нових рядків решта — значення за замовчуванням)"""
+        if columns not in self.upserts:
+            table = models.Contact.__table__
+            set_ = {name: self.insert.excluded[name] for name in columns if name != "email"}
+            set_["version"] = table.c.version + 1
+            self.upserts[columns] = self.insert.on_conflict_do_update(
+                index_elements=[table.c.email], set_=set_
+            ).returning(table.c.id, table.c.email)
+        return self.upserts[columns]
+
+    def _write(self, result: dict):
+        status = result["status"]
+        self.stats[status] += 1
+        self.report.write(json.dumps(result, default=str).encode() + b"\n")
+
+    def add(self, row_number: int, raw):
+        self.stats["total"] += 1
+        if raw is INVALID_UTF8:
+            self._write({"row": row_number, "status": "invalid", "errors": "Invalid UTF-8"})
+            return
+        if not isinstance(raw, dict):
+            self._write({"row": row_number, "status": "invalid", "errors": "Invalid JSON object"})
+            return
+        try:
+            contact = schemas.ContactCreate.model_validate(raw)
+        except ValidationError as exc:
+            errors = json.loads(exc.json(include_url=False))
+            self._write({"row": row_number, "status": "invalid", "errors": errors})
+            return
+
+        # лише передані поля: відсутні не мають затирати дані існуючого контакту
+        values = crud.contact_values(contact.model_dump(exclude_unset=True))
+        keys = {("email", values["email"])}
+        if values.get("phone"):
+            keys.add(("phone", values["phone"]))
+        # один email/телефон двічі в одному INSERT — спершу записуємо попередню пачку
+        if keys & self.batch_keys:
+            self.flush()
+        self.batch.append((row_number, values))
+        self.batch_keys |= keys
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def _upsert(self, batch):
+        emails = [values["email"] for _, values in batch]
+        existing = set(self.db.scalars(select(models.Contact.email).where(models.Contact.email.in_(emails))))
+        groups = {}
+        for _, values in batch:
+            groups.setdefault(tuple(sorted(values)), []).append(values)
+        ids = {}
+        for columns, rows in groups.items():
+            ids.update((email, contact_id) for contact_id, email in self.db.execute(self._upsert_statement(columns), rows))
+        self.db.commit()
+        for row_number, values in batch:
+            email = values["email"]
+            if email in existing:
+                contact_cache.invalidate(ids.get(email))
+            status = "updated" if email in existing else "created"
+            self._write({"row": row_number, "status": status, "id": ids.get(email)})
+        contact_cache.invalidate()
+
+    def flush(self):
+        batch, self.batch = self.batch, []
+        self.batch_keys = set()
+        if not batch:
+            return
+        try:
+            self._upsert(batch)
+        except IntegrityError:
+            self.db.rollback()
+            # пачка впала (наприклад, телефон зайнятий іншим контактом) — шукаємо винні рядки поодинці
+            for row_number, values in batch:
+                try:
+                    self._upsert([(row_number, values)])
+                except IntegrityError:
+                    self.db.rollback()
+                    self._write({"row": row_number, "status": "failed", "errors": "Phone or email already exists"})
+
+
+def import_contacts(db: Session, upload, format: str = "ndjson", batch_size: int = 500):
+    """Імпортує NDJSON/CSV з файлу, повертає звіт (NDJSON: рядок на запис + підсумок)"""
+    report = spooled_file()
+    importer = BulkImporter(db, report, batch_size=batch_size)
+    rows = _read_csv(upload) if format == "csv" else _read_ndjson(upload)
+    for row_number, raw in rows:
+        importer.add(row_number, raw)
+    importer.flush()
+    report.write(json.dumps({"summary": importer.stats}).encode() + b"\n")
+    report.seek(0)
+    return report
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Response
+
+from app import schemas
+from app.config import settings
+
+
+class CacheBackend:
+    """Інтерфейс кешу; Redis-сумісний бекенд має реалізувати ті самі методи"""
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def incr(self, key: str, amount: int = 1):
+        """Лічильник без TTL і витіснення (як INCRBY у Redis), повертає нове значення"""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """LRU з TTL у пам'яті процесу (потокобезпечний — sync-ендпоінти працюють у threadpool)"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str, amount: int = 1):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "lru", "size": len(self._data), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+def make_etag(body: bytes):
+    """Хеш тіла відповіді: id у SQLite перевикористовуються, тож "id.версія" може повторитися в нового контакту"""
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str):
+    if not if_none_match:
+        return False
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def contact_response(entry, if_none_match: Optional[str] = None):
+    """200 з закешованим JSON або 304, якщо клієнт уже має цю версію"""
+    etag, body = entry
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def contact_list_response(entry):
+    body, next_cursor = entry
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class ContactCache:
+    """Кеш серіалізованих відповідей: окремий контакт (ETag + JSON) і сторінки списку"""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    def generation(self):
+        """Лічильник записів: змінюється при кожній інвалідації (списки скидаються разом, без пошуку ключів).
+
+        Його беруть до читання з БД і передають у set_*, щоб не закешувати дані, які змінилися під час читання.
+        """
+        return self.backend.incr("contacts:list:generation", 0)
+
+    def get_contact(self, contact_id: int):
+        return self.backend.get(f"contacts:{contact_id}")
+
+    def set_contact(self, contact, generation: int):
+        body = schemas.ContactOut.model_validate(contact).model_dump_json().encode()
+        entry = (make_etag(body), body)
+        key = f"contacts:{contact.id}"
+        self.backend.set(key, entry)
+        # запис між читанням і set: прибираємо щойно покладене (перевірка після set, щоб не було вікна)
+        if self.generation() != generation:
+            self.backend.delete(key)
+        return entry
+
+    def _list_key(self, params: dict, generation: int):
+        return f"contacts:list:{generation}:{json.dumps(params, sort_keys=True)}"
+
+    def get_list(self, params: dict):
+        return self.backend.get(self._list_key(params, self.generation()))
+
+    def set_list(self, params: dict, body: bytes, next_cursor: Optional[str], generation: int):
+        # ключ зі старим поколінням після запису вже ніхто не прочитає
+        entry = (body, next_cursor)
+        self.backend.set(self._list_key(params, generation), entry)
+        return entry
+
+    def invalidate(self, contact_id: Optional[int] = None):
+        """Скидає контакт (якщо вказано) і всі закешовані сторінки списку"""
+        if contact_id is not None:
+            self.backend.delete(f"contacts:{contact_id}")
+        self.backend.incr("contacts:list:generation")
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return self.backend.stats()
+
+
+contact_cache = ContactCache(LRUCache(max_size=settings.cache_max_size, ttl=settings.cache_ttl))
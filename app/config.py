@@ -0,0 +1,34 @@
+import os
+
+
+def _env_bool(name: str, default: bool = False):
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Налаштування з змінних оточення (значення за замовчуванням — як було раніше)
+class Settings:
+    def __init__(self):
+        self.database_url = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.db_pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.db_echo = _env_bool("DB_ECHO")
+        # async-режим: ендпоінти на AsyncSession під префіксом /async
+        self.db_async = _env_bool("DB_ASYNC")
+        self.sqlite_busy_timeout = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+        # кеш контактів у пам'яті процесу (CACHE_MAX_SIZE=0 — вимкнено)
+        self.cache_max_size = int(os.getenv("CACHE_MAX_SIZE", "10000"))
+        self.cache_ttl = float(os.getenv("CACHE_TTL", "30"))
+        # інструментування: поріг повільних SQL-запитів і заголовок Server-Timing
+        self.slow_query_ms = float(os.getenv("SLOW_QUERY_MS", "200"))
+        self.server_timing = _env_bool("SERVER_TIMING")
+        # розсилка привітань: розмір пачки, одночасних відправлень, SMTP (без SMTP_HOST — фейковий відправник)
+        self.greeting_batch_size = int(os.getenv("GREETING_BATCH_SIZE", "500"))
+        self.greeting_concurrency = int(os.getenv("GREETING_CONCURRENCY", "20"))
+        self.smtp_host = os.getenv("SMTP_HOST", "")
+        self.smtp_port = int(os.getenv("SMTP_PORT", "25"))
+        self.smtp_from = os.getenv("SMTP_FROM", "noreply@example.com")
+
+
+settings = Settings()
@@ -1,8 +1,12 @@
+import calendar
+from typing import Optional
 from datetime import date, timedelta
+from sqlalchemy import case, delete, extract, insert, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
-from app import models, schemas
+from app import models, pagination, schemas
+from app.cache import contact_cache
 
 
 # --- ITEMS ---
@@ -23,20 +27,84 @@ def get_items(db: Session, skip: int = 0, limit: int = 10):
 
 
 # --- CONTACTS ---
-def create_contact(db: Session, contact: schemas.ContactCreate):
-    db_contact = models.Contact(**contact.dict())
-    db.add(db_contact)
+# Запис контактів — один SQL-запит на операцію (INSERT/UPDATE/DELETE ... RETURNING)
+def contact_values(data: dict):
+    values = dict(data)
+    if "birthday" in values:
+        # @validates не спрацьовує для INSERT/UPDATE-виразів, тому ключ рахуємо тут
+        values["birthday_key"] = models.make_birthday_key(values["birthday"])
+    return values
+
+
+def insert_contact_statement(data: dict):
+    return insert(models.Contact).values(**contact_values(data)).returning(models.Contact)
+
+
+def update_contact_statement(contact_id: int, data: dict):
+    return (
+        update(models.Contact)
+        .where(models.Contact.id == contact_id)
+        .values(**contact_values(data), version=models.Contact.version + 1)
+        .returning(models.Contact)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_contact_statement(contact_id: int):
+    return delete(models.Contact).where(models.Contact.id == contact_id).returning(models.Contact.id)
+
+
+def _execute_write(db: Session, statement):
     try:
+        result = db.scalar(statement)
+        # від'єднуємо об'єкт, щоб commit не позначив його застарілим (інакше буде ще один SELECT)
+        if isinstance(result, models.Contact):
+            db.expunge(result)
         db.commit()
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Phone or email already exists")
-    db.refresh(db_contact)
+    return result
+
+
+def create_contact(db: Session, contact: schemas.ContactCreate):
+    db_contact = _execute_write(db, insert_contact_statement(contact.dict()))
+    contact_cache.invalidate()
     return db_contact
 
 
-def get_contacts(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(models.Contact).offset(skip).limit(limit).all()
+def contact_rows_statement(fields, sort: str = "id", skip: int = 0, limit: int = 10, after: Optional[list] = None):
+    """SELECT лише потрібних колонок (+ ключ сортування для курсора), без завантаження ORM-об'єктів.
+
+    З `after` — keyset-пагінація (наступні `limit` рядків після ключа), інакше OFFSET `skip`.
+    """
+    table = models.Contact.__table__
+    order = pagination.SORT_KEYS[sort]
+    columns = [table.c[name] for name in fields]
+    columns += [column for column in order if column.key not in fields]
+    query = select(*columns).order_by(*order).limit(limit)
+    if after is not None:
+        return query.where(tuple_(*order) > tuple_(*after))
+    return query.offset(skip)
+
+
+def get_contact_rows(db: Session, fields, sort: str = "id", skip: int = 0, limit: int = 10, after: Optional[list] = None):
+    return db.execute(contact_rows_statement(fields, sort=sort, skip=skip, limit=limit, after=after)).all()
+
+
+def iter_contact_rows(db: Session, chunk_size: int = 1000):
+    """Віддає всі контакти пачками словників, пам'ять не залежить від розміру таблиці"""
+    columns = [models.Contact.__table__.c[name] for name in schemas.ContactOut.model_fields]
+    last_id = None
+    while True:
+        query = select(*columns).order_by(models.Contact.id).limit(chunk_size)
+        if last_id is not None:
+            query = query.where(models.Contact.id > last_id)
+        rows = db.execute(query).mappings().all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]["id"]
 
 
 def get_contact(db: Session, contact_id: int):
@@ -46,57 +114,83 @@ def get_contact(db: Session, contact_id: int):
 # --- UPDATE CONTACT ---
 def update_contact_full(db: Session, contact_id: int, contact_in: schemas.ContactCreate):
     """PUT — повне оновлення (усі поля обов’язкові)"""
-    db_contact = get_contact(db, contact_id)
-    if not db_contact:
-        return None
-    for key, value in contact_in.dict().items():
-        setattr(db_contact, key, value)
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Phone or email already exists")
-    db.refresh(db_contact)
+    db_contact = _execute_write(db, update_contact_statement(contact_id, contact_in.dict()))
+    if db_contact:
+        contact_cache.invalidate(contact_id)
     return db_contact
 
 
 def update_contact_partial(db: Session, contact_id: int, contact_in: schemas.ContactUpdate):
     """PATCH — часткове оновлення (тільки передані поля)"""
-    db_contact = get_contact(db, contact_id)
-    if not db_contact:
-        return None
-    for key, value in contact_in.dict(exclude_unset=True).items():
-        setattr(db_contact, key, value)
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Phone or email already exists")
-    db.refresh(db_contact)
+    db_contact = _execute_write(db, update_contact_statement(contact_id, contact_in.dict(exclude_unset=True)))
+    if db_contact:
+        contact_cache.invalidate(contact_id)
     return db_contact
 
 
 def delete_contact(db: Session, contact_id: int):
-    db_contact = get_contact(db, contact_id)
-    if not db_contact:
+    deleted_id = _execute_write(db, delete_contact_statement(contact_id))
+    if deleted_id is None:
         return False
-    db.delete(db_contact)
-    db.commit()
+    contact_cache.invalidate(contact_id)
     return True
 
 
-def contacts_with_birthdays_next_days(db: Session, days: int = 7):
-    today = date.today()
+def birthday_window(days: int = 7, today: Optional[date] = None):
+    """Умова по індексу birthday_key: день народження у найближчі `days` днів (None — увесь рік)"""
+    if days >= 365:
+        return None
+    today = today or date.today()
+    key = models.Contact.birthday_key
     end_date = today + timedelta(days=days)
-
-    contacts = db.query(models.Contact).all()
-    result = []
-
-    for contact in contacts:
-        if contact.birthday:
-            birthday_this_year = contact.birthday.replace(year=today.year)
-            if today <= birthday_this_year <= end_date:
-                result.append(contact)
-
-    return result
-
+    start_key = models.make_birthday_key(today)
+    end_key = models.make_birthday_key(end_date)
+
+    if start_key <= end_key:
+        in_window = key.between(start_key, end_key)
+    else:
+        # вікно переходить через Новий рік
+        in_window = or_(key >= start_key, key <= end_key)
+
+    # 29 лютого у невисокосний рік святкуємо 28 лютого
+    for year in {today.year, end_date.year}:
+        if not calendar.isleap(year) and today <= date(year, 2, 28) <= end_date:
+            return or_(in_window, key == 229)
+    return in_window
+
+
+def upcoming_birthdays_select(days: int = 7, today: Optional[date] = None):
+    """SELECT контактів з днями народження у найближчі `days` днів (один запит по індексу birthday_key)"""
+    today = today or date.today()
+    key = models.Contact.birthday_key
+    query = select(models.Contact).where(key.isnot(None))
+
+    in_window = birthday_window(days, today)
+    if in_window is None:
+        return query.order_by(key, models.Contact.id)
+    order = case((key >= models.make_birthday_key(today), 0), else_=1)
+    return query.where(in_window).order_by(order, key, models.Contact.id)
+
+
+def contacts_with_birthdays_next_days(db: Session, days: int = 7, today: Optional[date] = None):
+    return db.scalars(upcoming_birthdays_select(days, today)).all()
+
+
+def backfill_birthday_keys(db: Session, batch_size: int = 10000):
+    """Заповнює birthday_key для рядків, створених до появи колонки"""
+    key_expr = extract("month", models.Contact.birthday) * 100 + extract("day", models.Contact.birthday)
+    total = 0
+    while True:
+        ids = select(models.Contact.id).where(
+            models.Contact.birthday.isnot(None), models.Contact.birthday_key.is_(None)
+        ).limit(batch_size)
+        result = db.execute(
+            update(models.Contact)
+            .where(models.Contact.id.in_(ids))
+            .values(birthday_key=key_expr)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
@@ -0,0 +1,69 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models, schemas
+from app.cache import contact_cache
+
+
+# Async-версії функцій з crud.py для AsyncSession
+
+
+# --- CONTACTS ---
+async def _execute_write(db: AsyncSession, statement):
+    try:
+        result = await db.scalar(statement)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Phone or email already exists")
+    return result
+
+
+async def create_contact(db: AsyncSession, contact: schemas.ContactCreate):
+    db_contact = await _execute_write(db, crud.insert_contact_statement(contact.model_dump()))
+    contact_cache.invalidate()
+    return db_contact
+
+
+async def get_contact_rows(db: AsyncSession, fields, sort: str = "id", skip: int = 0, limit: int = 10, after: Optional[list] = None):
+    result = await db.execute(crud.contact_rows_statement(fields, sort=sort, skip=skip, limit=limit, after=after))
+    return result.all()
+
+
+async def get_contact(db: AsyncSession, contact_id: int):
+    return await db.get(models.Contact, contact_id)
+
+
+# --- UPDATE CONTACT ---
+async def update_contact_full(db: AsyncSession, contact_id: int, contact_in: schemas.ContactCreate):
+    """PUT — повне оновлення (усі поля обов’язкові)"""
+    db_contact = await _execute_write(db, crud.update_contact_statement(contact_id, contact_in.model_dump()))
+    if db_contact:
+        contact_cache.invalidate(contact_id)
+    return db_contact
+
+
+async def update_contact_partial(db: AsyncSession, contact_id: int, contact_in: schemas.ContactUpdate):
+    """PATCH — часткове оновлення (тільки передані поля)"""
+    values = contact_in.model_dump(exclude_unset=True)
+    db_contact = await _execute_write(db, crud.update_contact_statement(contact_id, values))
+    if db_contact:
+        contact_cache.invalidate(contact_id)
+    return db_contact
+
+
+async def delete_contact(db: AsyncSession, contact_id: int):
+    deleted_id = await _execute_write(db, crud.delete_contact_statement(contact_id))
+    if deleted_id is None:
+        return False
+    contact_cache.invalidate(contact_id)
+    return True
+
+
+async def contacts_with_birthdays_next_days(db: AsyncSession, days: int = 7, today: Optional[date] = None):
+    result = await db.scalars(crud.upcoming_birthdays_select(days, today))
+    return result.all()
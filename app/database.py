@@ -1,10 +1,65 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+from app.config import settings
+
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+# async-драйвери для тих самих баз
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def is_sqlite(url: str):
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def engine_options(url: str):
+    options = {"echo": settings.db_echo, "pool_pre_ping": not is_sqlite(url)}
+    if is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+        # :memory: працює на StaticPool/SingletonThreadPool без налаштувань розміру
+        if make_url(url).database in (None, "", ":memory:"):
+            return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    return options
+
+
+def async_url(url: str):
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.get_backend_name()])
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL + synchronous=NORMAL: читачі не блокують запис, менше fsync; busy_timeout замість 'database is locked'"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout}")
+    cursor.close()
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+if is_sqlite(SQLALCHEMY_DATABASE_URL):
+    event.listen(engine, "connect", set_sqlite_pragmas)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_async:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(async_url(SQLALCHEMY_DATABASE_URL), **engine_options(SQLALCHEMY_DATABASE_URL))
+    if is_sqlite(SQLALCHEMY_DATABASE_URL):
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
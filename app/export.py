@@ -0,0 +1,38 @@
+import csv
+import io
+import json
+
+from app import crud, schemas
+
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+FIELDS = list(schemas.ContactOut.model_fields)
+
+
+def _ndjson_chunk(rows):
+    return "".join(json.dumps(dict(row), default=str, ensure_ascii=False) + "\n" for row in rows)
+
+
+def _csv_chunk(rows, header: bool = False):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def stream_contacts(session_factory, format: str = "ndjson", chunk_size: int = 1000):
+    """Генератор експорту: одна пачка рядків з БД — один шматок відповіді"""
+    db = session_factory()
+    try:
+        if format == "csv":
+            yield _csv_chunk([], header=True)
+        for rows in crud.iter_contact_rows(db, chunk_size=chunk_size):
+            yield _csv_chunk(rows) if format == "csv" else _ndjson_chunk(rows)
+    finally:
+        db.close()
@@ -0,0 +1,333 @@
+"""Розсилка привітань з днем народження.
+
+Контакти з найближчими днями народження, яких ще не вітали з цим днем народження (greeted_on
+порожній або стосується минулорічного), обробляються пачками по id (keyset). На кожну пачку:
+  1. одним UPDATE ... RETURNING контакти позначаються sent=true, greeted_on=дата прогону ("забираються"),
+     у тій самій транзакції зсувається чекпоінт прогону (greeting_runs.last_contact_id);
+  2. привітання відправляються паралельно, не більше `concurrency` одночасно;
+  3. невдалим відправленням greeted_on очищається — їх підбере наступний прогін.
+На початку нового прогону sent скидається в false у тих, чий день народження вже поза вікном;
+від повторного привітання захищає greeted_on, тож sent=false з PUT, PATCH чи імпорту його не спричинить.
+Якщо процес впав, наступний запуск того ж дня продовжує незавершений прогін з чекпоінта.
+Контакт позначається до відправлення, тож повторно він не отримає привітання навіть після збою
+(ціна — пачка, що обірвалася посеред відправлення, вважається надісланою).
+
+    python -m app.greetings --days 7
+"""
+import argparse
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+from datetime import date, datetime, timedelta
+from email.message import EmailMessage
+from typing import Optional
+
+from sqlalchemy import and_, not_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import crud, metrics, models
+from app.cache import contact_cache
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger("app.greetings")
+
+# Один прогін на процес; між процесами від подвійної відправки захищає умова в UPDATE ... WHERE
+_lock = threading.Lock()
+
+# Більше вікно вже перекривалося б з минулорічним днем народження
+MAX_DAYS = 31
+
+
+class Sender:
+    """Інтерфейс відправника; send кидає виняток, якщо доставка не вдалася"""
+
+    async def send(self, contact) -> None:
+        raise NotImplementedError
+
+
+class FakeSender(Sender):
+    """Нічого не відправляє, лише запам'ятовує (для тестів і локального запуску)"""
+
+    def __init__(self, delay: float = 0.0, fail_ids=()):
+        self.delay = delay
+        self.fail_ids = set(fail_ids)
+        self.delivered = []
+
+    async def send(self, contact) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if contact.id in self.fail_ids:
+            raise RuntimeError(f"delivery to contact {contact.id} failed")
+        self.delivered.append(contact.id)
+        logger.debug("greeting for contact %s", contact.id)
+
+
+class SmtpSender(Sender):
+    def __init__(self, host: str, port: int = 25, sender: str = "noreply@example.com"):
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    def _send(self, contact):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = contact.email
+        message["Subject"] = "З днем народження!"
+        message.set_content(f"Вітаємо з днем народження, {contact.first_name}!")
+        with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+            smtp.send_message(message)
+
+    async def send(self, contact) -> None:
+        # smtplib блокуючий — відправляємо в потоці, щоб не зупиняти інші відправлення
+        await asyncio.to_thread(self._send, contact)
+
+
+def default_senders():
+    """email через SMTP (якщо задано SMTP_HOST), sms — фейковий, доки не підключено провайдера"""
+    email = SmtpSender(settings.smtp_host, settings.smtp_port, settings.smtp_from) if settings.smtp_host else FakeSender()
+    return {"email": email, "sms": FakeSender()}
+
+
+def channel(contact):
+    """SMS лише якщо його обрано і є телефон, інакше email"""
+    return "sms" if contact.preferred_contact_method == "sms" and contact.phone else "email"
+
+
+def run_stats(run: models.GreetingRun):
+    return {
+        "id": run.id,
+        "status": run.status,
+        "run_date": run.run_date,
+        "days": run.days,
+        "last_contact_id": run.last_contact_id,
+        "claimed": run.claimed,
+        "sent": run.sent,
+        "failed": run.failed,
+        "batches": run.batches,
+        "elapsed": round(run.elapsed, 3),
+        "throughput": round(run.sent / run.elapsed, 2) if run.elapsed else 0.0,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+        "error": run.error,
+    }
+
+
+def latest_runs(db: Session, limit: int = 10):
+    return db.scalars(select(models.GreetingRun).order_by(models.GreetingRun.id.desc()).limit(limit)).all()
+
+
+def _greeted_before(run: models.GreetingRun):
+    """Привітання не пізніше цієї дати стосувалися попереднього дня народження, а не того, що у вікні"""
+    return run.run_date + timedelta(days=run.days - 365)
+
+
+def _not_greeted(run: models.GreetingRun):
+    contact = models.Contact
+    return or_(
+        contact.greeted_on <= _greeted_before(run),
+        # контакти без greeted_on з sent=true привітали ще до появи колонки
+        and_(contact.greeted_on.is_(None), contact.sent.isnot(True)),
+    )
+
+
+def _reset_sent(db: Session, run: models.GreetingRun):
+    """sent=false, якщо день народження вже поза вікном або привітання стосувалося попереднього"""
+    contact = models.Contact
+    stale = or_(contact.greeted_on <= _greeted_before(run), not_(crud.birthday_window(run.days, run.run_date)))
+    reset = db.scalars(
+        update(contact)
+        .where(contact.sent.is_(True), stale)
+        .values(sent=False, version=contact.version + 1)
+        .returning(contact.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    for contact_id in reset:
+        contact_cache.invalidate(contact_id)
+
+
+def unfinished_run(db: Session):
+    return db.scalars(
+        select(models.GreetingRun)
+        .where(models.GreetingRun.status.notin_(("finished", "abandoned")))
+        .order_by(models.GreetingRun.id.desc())
+    ).first()
+
+
+def _start_run(db: Session, days: int, today: date):
+    """Продовжує незавершений сьогоднішній прогін (після збою) або починає новий.
+
+    Незавершений прогін продовжується лише з тим самим days — інакше вікно і чекпоінт не узгоджені.
+    """
+    run = unfinished_run(db)
+    if run is not None and run.run_date == today:
+        if run.days != days:
+            raise ValueError(f"Unfinished greeting run {run.id} uses days={run.days}; resume it with the same days")
+        logger.info("resuming greeting run %s after contact %s", run.id, run.last_contact_id)
+        run.status = "running"
+        run.error = None
+        db.commit()
+        return run
+    if run is not None:
+        # вчорашній обірваний прогін не доганяємо: його вікно днів народження вже інше
+        run.status = "abandoned"
+    run = models.GreetingRun(status="running", run_date=today, days=days, last_contact_id=0, claimed=0,
+                             sent=0, failed=0, batches=0, elapsed=0.0, started_at=datetime.now())
+    db.add(run)
+    _reset_sent(db, run)
+    db.commit()
+    return run
+
+
+def _claim_batch(db: Session, run: models.GreetingRun, batch_size: int):
+    """Наступна пачка: SELECT id по індексах + один UPDATE sent=true ... RETURNING, разом з чекпоінтом"""
+    contact = models.Contact
+    query = select(contact.id).where(contact.birthday_key.isnot(None), _not_greeted(run), contact.id > run.last_contact_id)
+    in_window = crud.birthday_window(run.days, run.run_date)
+    if in_window is not None:
+        query = query.where(in_window)
+    ids = db.scalars(query.order_by(contact.id).limit(batch_size)).all()
+    if not ids:
+        return []
+
+    claimed = db.execute(
+        update(contact)
+        .where(contact.id.in_(ids), _not_greeted(run))
+        .values(sent=True, greeted_on=run.run_date, version=contact.version + 1)
+        .returning(contact.id, contact.first_name, contact.email, contact.phone, contact.preferred_contact_method)
+        .execution_options(synchronize_session=False)
+    ).all()
+    run.last_contact_id = ids[-1]
+    run.claimed += len(claimed)
+    run.batches += 1
+    db.commit()
+    for row in claimed:
+        contact_cache.invalidate(row.id)
+    return claimed
+
+
+def _release_failed(db: Session, failed_ids):
+    db.execute(
+        update(models.Contact)
+        .where(models.Contact.id.in_(failed_ids))
+        .values(sent=False, greeted_on=None, version=models.Contact.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    for contact_id in failed_ids:
+        contact_cache.invalidate(contact_id)
+
+
+async def _dispatch(
+    session_factory=SessionLocal,
+    senders: Optional[dict] = None,
+    days: int = 7,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    today: Optional[date] = None,
+):
+    if not 0 <= days <= MAX_DAYS:
+        raise ValueError(f"days must be between 0 and {MAX_DAYS}")
+    senders = senders or default_senders()
+    batch_size = batch_size or settings.greeting_batch_size
+    semaphore = asyncio.Semaphore(concurrency or settings.greeting_concurrency)
+
+    async def send_one(contact):
+        name = channel(contact)
+        async with semaphore:
+            try:
+                await senders[name].send(contact)
+            except Exception:
+                logger.exception("greeting for contact %s via %s failed", contact.id, name)
+                metrics.GREETINGS.inc((name, "failed"))
+                return False
+        metrics.GREETINGS.inc((name, "sent"))
+        return True
+
+    db = session_factory()
+    try:
+        run = _start_run(db, days, today or date.today())
+        try:
+            while True:
+                started = time.perf_counter()
+                batch = _claim_batch(db, run, batch_size)
+                if not batch:
+                    break
+                results = await asyncio.gather(*(send_one(contact) for contact in batch))
+                failed_ids = [contact.id for contact, ok in zip(batch, results) if not ok]
+                if failed_ids:
+                    _release_failed(db, failed_ids)
+                run.sent += len(batch) - len(failed_ids)
+                run.failed += len(failed_ids)
+                run.elapsed += time.perf_counter() - started
+                db.commit()
+            run.status = "finished"
+            run.finished_at = datetime.now()
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            run.status = "failed"
+            run.error = str(exc)[:500]
+            db.commit()
+            raise
+        contact_cache.invalidate()
+        return run_stats(run)
+    finally:
+        db.close()
+
+
+async def dispatch(
+    session_factory=SessionLocal,
+    senders: Optional[dict] = None,
+    days: int = 7,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    today: Optional[date] = None,
+):
+    """Один прогін розсилки; повертає статистику (див. run_stats)"""
+    if not _lock.acquire(blocking=False):
+        raise RuntimeError("Greeting dispatch is already running")
+    try:
+        return await _dispatch(session_factory, senders, days, batch_size, concurrency, today)
+    finally:
+        _lock.release()
+
+
+def start_in_background(**kwargs):
+    """Запускає прогін в окремому потоці з власним event loop (не тримає HTTP-запит і його метрики).
+
+    Блокування береться тут і звільняється потоком; False — прогін уже йде.
+    """
+    if not _lock.acquire(blocking=False):
+        return False
+
+    def target():
+        try:
+            asyncio.run(_dispatch(**kwargs))
+        except Exception:
+            logger.exception("greeting dispatch failed")
+        finally:
+            _lock.release()
+
+    try:
+        threading.Thread(target=target, name="greeting-dispatch", daemon=True).start()
+    except Exception:
+        _lock.release()
+        raise
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--concurrency", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    stats = asyncio.run(dispatch(days=args.days, batch_size=args.batch_size, concurrency=args.concurrency))
+    print(f"sent {stats['sent']}, failed {stats['failed']} in {stats['elapsed']}s ({stats['throughput']}/s)")
+
+
+if __name__ == "__main__":
+    main()
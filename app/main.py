@@ -1,16 +1,41 @@
-from fastapi import FastAPI, Depends, HTTPException, Request
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from starlette.background import BackgroundTask
+
+from app import models, schemas, crud, search, pagination, export, bulk, metrics, serialization, greetings
+from app.cache import contact_cache, contact_list_response, contact_response
+from app.config import settings
+from app.database import engine, async_engine, SessionLocal, Base 
+from app.migrations import upgrade_contacts_table
 
-from app import models, schemas, crud
-from app.database import engine, SessionLocal, Base 
+# orjson замість стандартного json для всіх JSON-відповідей
+app = FastAPI(title="Contacts API", default_response_class=serialization.ORJSONResponse)
 
-app = FastAPI(title="Contacts API")
+# Метрики запитів і SQL (/metrics), опційно заголовок Server-Timing
+app.add_middleware(metrics.MetricsMiddleware, server_timing=settings.server_timing)
+metrics.instrument_engine(engine)
+if async_engine is not None:
+    metrics.instrument_engine(async_engine.sync_engine)
 
 # Створюємо таблиці (тільки один раз)
 Base.metadata.create_all(bind=engine)
+# Доганяємо схему старих баз (birthday_key)
+upgrade_contacts_table(engine)
+# Пошуковий індекс (FTS5 / pg_trgm), синхронізується тригерами
+search.setup_search_index(engine)
+
+# Async-версії ендпоінтів контактів (/async/contacts/...)
+if settings.db_async:
+    from app import async_api
+
+    app.include_router(async_api.router, prefix="/async")
 
 # Dependency для сесії
 def get_db():
@@ -43,18 +68,107 @@ def create_contact(contact: schemas.ContactCreate, db: Session = Depends(get_db)
     return crud.create_contact(db, contact)
 
 
-# READ
+# BULK IMPORT (NDJSON або CSV у тілі запиту, upsert за email)
+@app.post("/contacts/bulk")
+async def bulk_import_contacts(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """Звіт — NDJSON: статус для кожного рядка (created/updated/invalid/failed) і підсумок в кінці"""
+    format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    upload = bulk.spooled_file()
+    async for chunk in request.stream():
+        upload.write(chunk)
+    upload.seek(0)
+    try:
+        report = await run_in_threadpool(bulk.import_contacts, db, upload, format, batch_size)
+    finally:
+        upload.close()
+    return StreamingResponse(report, media_type="application/x-ndjson", background=BackgroundTask(report.close))
+
+
+# SEARCH (до /contacts/{contact_id}, щоб шлях не сприйнявся як id)
+@app.get("/contacts/search/", response_model=list[schemas.ContactOut])
+def search_contacts(
+    query: str = Query(..., min_length=1, max_length=255),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    return search.search_contacts(db, query, skip=skip, limit=limit)
+
+
+# EXPORT (потоково, пачками по chunk_size рядків)
+@app.get("/contacts/export")
+def export_contacts(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    chunk_size: int = Query(1000, ge=1, le=10000),
+):
+    # окрема сесія: генератор працює вже після виходу з ендпоінта
+    return StreamingResponse(
+        export.stream_contacts(SessionLocal, format, chunk_size),
+        media_type=export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=contacts.{format}"},
+    )
+
+
+# READ (через кеш; If-None-Match з актуальним ETag -> 304 без звернення до БД)
 @app.get("/contacts/{contact_id}", response_model=schemas.ContactOut)
-def read_contact(contact_id: int, db: Session = Depends(get_db)):
-    contact = crud.get_contact(db, contact_id)
-    if not contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
+def read_contact(contact_id: int, if_none_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    generation = contact_cache.generation()
+    entry = contact_cache.get_contact(contact_id)
+    if entry is None:
+        contact = crud.get_contact(db, contact_id)
+        if not contact:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        entry = contact_cache.set_contact(contact, generation)
+    return contact_response(entry, if_none_match)
 
 
 @app.get("/contacts/", response_model=list[schemas.ContactOut])
-def read_contacts(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return crud.get_contacts(db, skip=skip, limit=limit)
+def read_contacts(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: Literal["id", "name"] = "id",
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Курсор наступної сторінки повертається в заголовку X-Next-Cursor (з cursor параметр skip ігнорується).
+
+    fields — список полів через кому (id додається завжди); з БД читаються лише ці колонки
+    """
+    columns = serialization.parse_fields(fields)
+    params = {"skip": skip, "limit": limit, "cursor": cursor, "sort": sort, "fields": ",".join(columns)}
+    generation = contact_cache.generation()
+    entry = contact_cache.get_list(params)
+    if entry is None:
+        after = pagination.decode_cursor(sort, cursor) if cursor else None
+        rows = crud.get_contact_rows(db, columns, sort=sort, skip=skip, limit=limit, after=after)
+        next_cursor = None
+        if rows and len(rows) == limit:
+            next_cursor = pagination.encode_cursor(sort, rows[-1])
+        entry = contact_cache.set_list(params, serialization.dump_rows(columns, rows), next_cursor, generation)
+    return contact_list_response(entry)
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return contact_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    cache = contact_cache.stats()
+    return PlainTextResponse(
+        metrics.render_metrics({
+            "contact_cache_hits": ("Contact cache hits", cache["hits"]),
+            "contact_cache_misses": ("Contact cache misses", cache["misses"]),
+            "contact_cache_size": ("Contact cache entries", cache["size"]),
+        }),
+        media_type="text/plain; version=0.0.4",
+    )
 
 
 # UPDATE (PUT — повне оновлення)
@@ -84,6 +198,30 @@ def delete_contact(contact_id: int, db: Session = Depends(get_db)):
     return {"message": f"Contact {contact_id} deleted successfully"}
 
 
+# BIRTHDAYS
+@app.get("/birthdays/", response_model=list[schemas.ContactOut])
+@app.get("/birthdays/next7", response_model=list[schemas.ContactOut])
+def upcoming_birthdays(days: int = Query(7, ge=0, le=366), db: Session = Depends(get_db)):
+    return crud.contacts_with_birthdays_next_days(db, days=days)
+
+
+# GREETINGS (розсилка привітань у фоні; статистика прогонів)
+@app.post("/greetings/dispatch", status_code=202)
+def dispatch_greetings(days: int = Query(7, ge=0, le=greetings.MAX_DAYS), db: Session = Depends(get_db)):
+    """Незавершений сьогоднішній прогін (після збою) продовжується; days має збігатися з його days"""
+    run = greetings.unfinished_run(db)
+    if run is not None and run.run_date == date.today() and run.days != days:
+        raise HTTPException(status_code=409, detail=f"Unfinished greeting run {run.id} uses days={run.days}")
+    if not greetings.start_in_background(days=days):
+        raise HTTPException(status_code=409, detail="Greeting dispatch is already running")
+    return {"message": "Greeting dispatch started"}
+
+
+@app.get("/greetings/stats", response_model=list[schemas.GreetingRunOut])
+def greeting_stats(limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    return [greetings.run_stats(run) for run in greetings.latest_runs(db, limit)]
+
+
 # Validation error handler
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger("app.sql")
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+
+
+# --- Метрики у форматі Prometheus (без сторонніх залежностей) ---
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, labels):
+    if not labelnames:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labels)) + "}"
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+    def render(self):
+        with self._lock:
+            samples = list(self._samples())
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *samples]
+
+
+class Counter(Metric):
+    type = "counter"
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def dec(self, labels=(), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels=(), value: float = 0):
+        with self._lock:
+            # [лічильники по кошиках..., загальна кількість, сума]
+            state = self._values.setdefault(labels, [0] * len(self.buckets) + [0, 0.0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += 1
+            state[-1] += value
+
+    def _samples(self):
+        bucket_labelnames = self.labelnames + ("le",)
+        for labels, state in sorted(self._values.items()):
+            for bound, count in zip(self.buckets + ("+Inf",), state[:-1]):
+                yield f"{self.name}_bucket{_format_labels(bucket_labelnames, labels + (bound,))} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {state[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {state[-2]}"
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status code", ("method", "route", "status"))
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests currently being processed", ("method",))
+QUERIES = Counter("db_queries_total", "SQL statements executed", ("route",))
+QUERY_LATENCY = Histogram("db_query_duration_seconds", "SQL statement latency", ("route",))
+QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements per HTTP request", ("method", "route"), buckets=QUERY_COUNT_BUCKETS
+)
+SLOW_QUERIES = Counter("db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS", ("route",))
+FAILED_QUERIES = Counter("db_query_errors_total", "SQL statements that raised an error", ("route",))
+GREETINGS = Counter("greetings_total", "Birthday greetings by channel and outcome", ("channel", "status"))
+
+METRICS = [REQUESTS, REQUEST_LATENCY, IN_PROGRESS, QUERIES, QUERY_LATENCY, QUERIES_PER_REQUEST,
+           SLOW_QUERIES, FAILED_QUERIES, GREETINGS]
+
+
+def render_metrics(extra_gauges: dict = None):
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, (documentation, value) in (extra_gauges or {}).items():
+        lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {value}"])
+    return "\n".join(lines) + "\n"
+
+
+# --- Статистика SQL в межах одного запиту ---
+def _route_template(scope):
+    """Шаблон шляху (/contacts/{contact_id}), щоб кількість міток не росла з кожним id"""
+    if scope.get("route") is None:
+        return "unmatched"
+    # відновлюємо шаблон із самого шляху: route.path у підключених роутерах не містить префікса
+    segments = scope["path"].split("/")
+    for name, value in scope.get("path_params", {}).items():
+        for i in range(len(segments) - 1, -1, -1):
+            if segments[i] == str(value):
+                segments[i] = "{" + name + "}"
+                break
+    return "/".join(segments)
+
+
+class RequestStats:
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.queries = 0
+        self.query_time = 0.0
+
+    @property
+    def route(self):
+        # маршрут стає відомим тільки після роутингу, тому читаємо його з scope щоразу
+        return _route_template(self.scope)
+
+
+# Значення — спільний змінюваний об'єкт, тож його бачать і потоки threadpool
+current_request: ContextVar = ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # час старту — на контексті виконання: він не переживає запит, навіть якщо той впав
+    context._metrics_started = time.perf_counter()
+
+
+def _record_query(context, statement, failed: bool = False):
+    # pop: помилка під час читання результату не має порахувати той самий запит удруге
+    started = vars(context).pop("_metrics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = current_request.get()
+    route = stats.route if stats else "background"
+    if stats:
+        stats.queries += 1
+        stats.query_time += elapsed
+    QUERIES.inc((route,))
+    QUERY_LATENCY.observe((route,), elapsed)
+    if failed:
+        FAILED_QUERIES.inc((route,))
+    if elapsed * 1000 >= settings.slow_query_ms:
+        SLOW_QUERIES.inc((route,))
+        logger.warning("slow query (%.1f ms) on %s: %.500s", elapsed * 1000, route, " ".join(statement.split()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query(context, statement)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute для запиту з помилкою (наприклад, IntegrityError) не викликається
+    if exception_context.execution_context is not None:
+        _record_query(exception_context.execution_context, exception_context.statement or "", failed=True)
+
+
+def instrument_engine(engine: Engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# --- ASGI middleware: латентність, статуси, запити в обробці, Server-Timing ---
+class MetricsMiddleware:
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    value = f"db;dur={stats.query_time * 1000:.2f};desc=\"{stats.queries} queries\", app;dur={total_ms:.2f}"
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", value.encode())]
+            await send(message)
+
+        IN_PROGRESS.inc((method,))
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_PROGRESS.dec((method,))
+            current_request.reset(token)
+            route = stats.route
+            elapsed = time.perf_counter() - started
+            REQUESTS.inc((method, route, str(status_code)))
+            REQUEST_LATENCY.observe((method, route), elapsed)
+            QUERIES_PER_REQUEST.observe((method, route), stats.queries)
@@ -0,0 +1,52 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app import crud, models
+from app.database import SessionLocal, engine as default_engine
+
+# Колонки, що з'явилися після першої версії таблиці contacts
+ADDED_COLUMNS = {
+    "birthday_key": "INTEGER",
+    "version": "INTEGER NOT NULL DEFAULT 1",
+    "greeted_on": "DATE",
+}
+
+
+# Доганяє схему вже існуючої таблиці contacts: нові колонки та індекси (create_all її не змінює)
+def upgrade_contacts_table(engine: Engine):
+    inspector = inspect(engine)
+    if not inspector.has_table(models.Contact.__tablename__):
+        return
+
+    columns = {column["name"] for column in inspector.get_columns(models.Contact.__tablename__)}
+    missing = [name for name in ADDED_COLUMNS if name not in columns]
+    with engine.begin() as conn:
+        for name in missing:
+            conn.execute(text(f"ALTER TABLE contacts ADD COLUMN {name} {ADDED_COLUMNS[name]}"))
+
+    existing_indexes = {index["name"] for index in inspector.get_indexes(models.Contact.__tablename__)}
+    for index in models.Contact.__table__.indexes:
+        if index.name not in existing_indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    # Нова колонка — одразу заповнюємо її для наявних рядків
+    if "birthday_key" in missing:
+        _backfill_birthday_keys(engine)
+
+
+def _backfill_birthday_keys(engine: Engine):
+    db = SessionLocal(bind=engine)
+    try:
+        return crud.backfill_birthday_keys(db)
+    finally:
+        db.close()
+
+
+def backfill(engine: Engine = default_engine):
+    """CLI: оновлює схему і дозаповнює birthday_key (зокрема для рядків, вставлених в обхід ORM)"""
+    upgrade_contacts_table(engine)
+    return _backfill_birthday_keys(engine)
+
+
+if __name__ == "__main__":
+    print(f"birthday_key backfilled for {backfill()} contacts")
@@ -1,6 +1,15 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Float, Index
+from sqlalchemy.orm import validates
 from app.database import Base  # Base з database.py
 
+
+def make_birthday_key(birthday):
+    """Ключ дня народження у форматі MMDD (наприклад, 31 грудня -> 1231)"""
+    if birthday is None:
+        return None
+    return birthday.month * 100 + birthday.day
+
+
 # Таблиця для зберігання товарів
 class Item(Base):
     __tablename__ = "items"
@@ -13,6 +22,10 @@ class Item(Base):
 # Таблиця для зберігання контактів
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (
+        # для keyset-пагінації з сортуванням за ім'ям
+        Index("ix_contacts_name_order", "last_name", "first_name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(50), nullable=False, index=True)
@@ -21,5 +34,36 @@ class Contact(Base):
     phone = Column(String(20), unique=True, nullable=True, index=True)
     preferred_contact_method = Column(String(10), default="email", index=True)
     sent = Column(Boolean, default=False)
+    # дата останнього привітання (sent лише показує, чи привітали з найближчим днем народження)
+    greeted_on = Column(Date, nullable=True)
     birthday = Column(Date, nullable=True)
+    # MMDD з birthday — індексований ключ для пошуку найближчих днів народження
+    birthday_key = Column(Integer, nullable=True, index=True)
     additional_info = Column(String(500), nullable=True)
+    # версія рядка, збільшується при кожному оновленні
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    @validates("birthday")
+    def _sync_birthday_key(self, key, value):
+        self.birthday_key = make_birthday_key(value)
+        return value
+
+
+# Прогін розсилки привітань з днем народження; рядок є чекпоінтом для відновлення після збою
+class GreetingRun(Base):
+    __tablename__ = "greeting_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String(20), nullable=False, default="running", index=True)
+    run_date = Column(Date, nullable=False)
+    days = Column(Integer, nullable=False)
+    # keyset-чекпоінт: контакти з id <= last_contact_id уже оброблені
+    last_contact_id = Column(Integer, nullable=False, default=0)
+    claimed = Column(Integer, nullable=False, default=0)
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    batches = Column(Integer, nullable=False, default=0)
+    elapsed = Column(Float, nullable=False, default=0.0)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    error = Column(String(500), nullable=True)
@@ -0,0 +1,45 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+from app import models
+
+
+# Доступні сортування для keyset-пагінації; id завжди останній — він унікальний
+SORT_KEYS = {
+    "id": (models.Contact.id,),
+    "name": (models.Contact.last_name, models.Contact.first_name, models.Contact.id),
+}
+
+
+def encode_cursor(sort: str, contact):
+    """contact — ORM-об'єкт або рядок select(), що містить колонки ключа сортування"""
+    values = [getattr(contact, column.key) for column in SORT_KEYS[sort]]
+    raw = json.dumps({"s": sort, "k": values}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _valid_value(column, value):
+    # bool — підклас int, але в курсор потрапити не може
+    return isinstance(value, column.type.python_type) and not isinstance(value, bool)
+
+
+def decode_cursor(sort: str, cursor: str):
+    """Повертає значення ключа сортування з курсора або 400, якщо курсор зіпсований"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        values = data["k"]
+        columns = SORT_KEYS[sort]
+        valid = (
+            data["s"] == sort
+            and isinstance(values, list)
+            and len(values) == len(columns)
+            and all(_valid_value(column, value) for column, value in zip(columns, values))
+        )
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
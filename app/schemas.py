@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 # --- ITEMS ---
 class ItemBase(BaseModel):
@@ -51,3 +51,21 @@ class ContactOut(ContactBase):
     model_config = {
         "from_attributes": True
     }
+
+
+# --- GREETINGS ---
+class GreetingRunOut(BaseModel):
+    id: int
+    status: str
+    run_date: date
+    days: int
+    last_contact_id: int
+    claimed: int
+    sent: int
+    failed: int
+    batches: int
+    elapsed: float
+    throughput: float  # успішних відправлень за секунду
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
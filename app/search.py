@@ -0,0 +1,120 @@
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+# FTS5 з trigram-токенізатором шукає будь-який підрядок від 3 символів
+MIN_TRIGRAM_LENGTH = 3
+
+contacts_fts = table("contacts_fts", column("rowid"), column("rank"))
+
+# Той самий вираз, що й в GIN-індексі на Postgres (інакше індекс не використається)
+PG_SEARCH_EXPR = "(first_name || ' ' || last_name || ' ' || email)"
+
+SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+        first_name, last_name, email,
+        content='contacts', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN
+        INSERT INTO contacts_fts(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_au AFTER UPDATE OF first_name, last_name, email ON contacts BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+        INSERT INTO contacts_fts(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END
+    """,
+]
+
+POSTGRES_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_contacts_search_trgm ON contacts USING gin ({PG_SEARCH_EXPR} gin_trgm_ops)",
+]
+
+
+def setup_search_index(engine: Engine):
+    """Створює пошуковий індекс (FTS5 на SQLite, pg_trgm + GIN на Postgres)"""
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contacts_fts'")
+            ).first()
+            for statement in SQLITE_SETUP:
+                conn.execute(text(statement))
+            # індекс щойно створено — заповнюємо його наявними контактами
+            if not exists:
+                conn.execute(text("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')"))
+        elif dialect == "postgresql":
+            for statement in POSTGRES_SETUP:
+                conn.execute(text(statement))
+
+
+def _escape_like(value: str):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_filter(pattern: str):
+    return or_(
+        models.Contact.first_name.ilike(pattern, escape="\\"),
+        models.Contact.last_name.ilike(pattern, escape="\\"),
+        models.Contact.email.ilike(pattern, escape="\\"),
+    )
+
+
+def search_contacts(db: Session, query: str, skip: int = 0, limit: int = 10):
+    """Пошук за ім'ям, прізвищем або email, найрелевантніші — першими.
+
+    Кожне слово запиту має бути підрядком імені, прізвища або email (однаково на SQLite і Postgres).
+    """
+    query = query.strip()
+    if not query:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    contacts = db.query(models.Contact)
+    terms = query.split()
+    long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+
+    if len(query) < MIN_TRIGRAM_LENGTH:
+        # короткі запити — пошук за префіксом
+        contacts = contacts.filter(_like_filter(_escape_like(query) + "%")).order_by(
+            models.Contact.last_name, models.Contact.first_name, models.Contact.id
+        )
+    elif dialect == "sqlite" and long_terms:
+        # кожне слово — окрема фраза в лапках (символи на кшталт @ чи - не є синтаксисом FTS), слова через AND;
+        # слова, коротші за триграму, FTS не знаходить — їх перевіряємо через LIKE
+        match = " AND ".join('"' + term.replace('"', '""') + '"' for term in long_terms)
+        contacts = (
+            contacts.join(contacts_fts, contacts_fts.c.rowid == models.Contact.id)
+            .filter(literal_column("contacts_fts").op("MATCH")(match))
+            .filter(*(_like_filter("%" + _escape_like(term) + "%") for term in terms if term not in long_terms))
+            .order_by(contacts_fts.c.rank, models.Contact.id)
+        )
+    elif dialect == "postgresql":
+        search_expr = literal_column(PG_SEARCH_EXPR)
+        contacts = contacts.filter(
+            *(search_expr.ilike("%" + _escape_like(term) + "%", escape="\\") for term in terms)
+        ).order_by(func.word_similarity(query, search_expr).desc(), models.Contact.id)
+    else:
+        contacts = contacts.filter(
+            *(_like_filter("%" + _escape_like(term) + "%") for term in terms)
+        ).order_by(models.Contact.id)
+
+    return contacts.offset(skip).limit(limit).all()
@@ -0,0 +1,43 @@
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from app import schemas
+
+try:
+    import orjson
+except ImportError:  # без orjson працює стандартний json, лише повільніше
+    orjson = None
+
+
+# Поля, які можна запросити через ?fields=; id повертається завжди (на ньому курсор і ETag)
+CONTACT_FIELDS = tuple(schemas.ContactOut.model_fields)
+
+
+def parse_fields(fields: Optional[str]):
+    """"first_name,email" -> ("id", "first_name", "email"); без параметра — усі поля ContactOut"""
+    if not fields:
+        return CONTACT_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(CONTACT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in CONTACT_FIELDS if name == "id" or name in requested)
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dump_rows(fields, rows) -> bytes:
+    """Рядки з БД одразу в JSON, без pydantic-валідації кожного рядка (дані вже пройшли її при записі)"""
+    return dumps([dict(zip(fields, row)) for row in rows])
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
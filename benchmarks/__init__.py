@@ -0,0 +1,3 @@
+def default_database_url(rows: int):
+    """Окрема SQLite-база на кожен розмір, щоб не заповнювати її повторно"""
+    return f"sqlite:///./benchmarks/bench_{rows}.db"
@@ -0,0 +1,180 @@
+"""Набір бенчмарків Contacts API.
+
+    python -m benchmarks seed --rows 1000000
+    python -m benchmarks run --rows 10000 --mode asgi --output results/base.json
+    python -m benchmarks run --rows 1000000 --mode uvicorn --workers 4 --concurrency 64 --output results/new.json
+    python -m benchmarks compare results/base.json results/new.json --threshold 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from benchmarks import default_database_url
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cmd_seed(args):
+    from benchmarks.seed import seed_contacts
+
+    seed_contacts(args.database_url or default_database_url(args.rows), args.rows, args.batch_size).dispose()
+
+
+async def _run(args, database_url: str):
+    import httpx
+
+    from benchmarks import runner
+
+    header = f"{'scenario':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    if args.mode == "asgi":
+        async with runner.asgi_client() as client:
+            print(header)
+            return await runner.run_all(client, args.rows, args.requests, args.concurrency, args.only)
+
+    server = runner.start_server(args.port, {"DATABASE_URL": database_url}, args.workers)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+            await runner.wait_until_ready(client)
+            print(header)
+            return await runner.run_all(client, args.rows, args.requests, args.concurrency, args.only)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def cmd_run(args):
+    database_url = args.database_url or default_database_url(args.rows)
+    if not args.skip_seed:
+        # окремий процес: app читає DATABASE_URL під час імпорту, а тут він ще має бути не імпортований
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks", "seed", "--rows", str(args.rows), "--database-url", database_url],
+            check=True,
+        )
+
+    # сценарії змінюють дані, тож SQLite-базу копіюємо, щоб кожен прогін стартував з однакового стану
+    workdir = tempfile.TemporaryDirectory()
+    run_url = database_url
+    if database_url.startswith("sqlite:///"):
+        run_path = os.path.join(workdir.name, "bench.db")
+        shutil.copyfile(database_url[len("sqlite:///"):], run_path)
+        run_url = f"sqlite:///{run_path}"
+
+    # налаштування застосунку читаються під час імпорту app, тому задаємо їх до нього
+    if "app.config" in sys.modules:
+        raise RuntimeError("app was imported before DATABASE_URL was set")
+    os.environ["DATABASE_URL"] = run_url
+    if not args.cache:
+        # інакше GET-сценарії міряють LRU-кеш, а не маршрут і базу (uvicorn успадковує оточення)
+        os.environ["CACHE_MAX_SIZE"] = "0"
+    try:
+        results = asyncio.run(_run(args, run_url))
+    finally:
+        workdir.cleanup()
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": database_url.split("://")[0],
+            "rows": args.rows,
+            "mode": args.mode,
+            "workers": args.workers if args.mode == "uvicorn" else None,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "cache": args.cache,
+        },
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"saved {args.output}")
+
+
+def _delta(old, new):
+    if old in (None, 0) or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def cmd_compare(args):
+    with open(args.base) as f:
+        base_report = json.load(f)
+    with open(args.new) as f:
+        new_report = json.load(f)
+    base, new = base_report["results"], new_report["results"]
+
+    for key in ("database", "rows", "mode", "workers", "concurrency", "cache"):
+        if base_report["meta"].get(key) != new_report["meta"].get(key):
+            print(f"warning: {key} differs ({base_report['meta'].get(key)} vs {new_report['meta'].get(key)})")
+
+    regressions = []
+    print(f"{'scenario':<20}{'p50 %':>10}{'p95 %':>10}{'p99 %':>10}{'req/s %':>10}")
+    for name in base:
+        if name not in new:
+            continue
+        deltas = {key: _delta(base[name][key], new[name][key]) for key in ("p50_ms", "p95_ms", "p99_ms", "rps")}
+        print(f"{name:<20}" + "".join(
+            f"{'-' if value is None else f'{value:+.1f}':>10}" for value in deltas.values()
+        ))
+        if deltas["p95_ms"] is not None and deltas["p95_ms"] > args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"p95 regressed by more than {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="заповнити базу синтетичними контактами")
+    seed.add_argument("--rows", type=int, default=10000)
+    seed.add_argument("--batch-size", type=int, default=100000)
+    seed.add_argument("--database-url")
+    seed.set_defaults(func=cmd_seed)
+
+    run = commands.add_parser("run", help="прогнати всі маршрути і зберегти JSON зі статистикою")
+    run.add_argument("--rows", type=int, default=10000)
+    run.add_argument("--database-url", help="за замовчуванням — benchmarks/bench_<rows>.db")
+    run.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    run.add_argument("--workers", type=int, default=1)
+    run.add_argument("--port", type=int, default=8765)
+    run.add_argument("--requests", type=int, default=200, help="запитів на сценарій")
+    run.add_argument("--concurrency", type=int, default=16)
+    run.add_argument("--only", nargs="*", help="лише вказані сценарії")
+    run.add_argument("--skip-seed", action="store_true")
+    run.add_argument("--cache", action="store_true", help="не вимикати кеш відповідей")
+    run.add_argument("--output")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="порівняти два JSON-звіти")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=10, help="допустиме погіршення p95, %%")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
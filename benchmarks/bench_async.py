@@ -0,0 +1,91 @@
+"""Запити/с для sync- та async-ендпоінтів під конкурентним навантаженням (реальний uvicorn).
+
+    python -m benchmarks.bench_async --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.runner import start_server, wait_until_ready
+
+SCENARIOS = [
+    ("sync  GET /contacts/{id}", "GET", "/contacts/{id}"),
+    ("async GET /contacts/{id}", "GET", "/async/contacts/{id}"),
+    ("sync  GET /contacts/", "GET", "/contacts/?limit=20"),
+    ("async GET /contacts/", "GET", "/async/contacts/?limit=20"),
+    ("sync  PATCH /contacts/{id}", "PATCH", "/contacts/{id}"),
+    ("async PATCH /contacts/{id}", "PATCH", "/async/contacts/{id}"),
+]
+
+
+async def seed(client: httpx.AsyncClient, rows: int):
+    body = "\n".join(
+        json.dumps({"first_name": "Bench", "last_name": f"User{i}", "email": f"bench{i}@example.com"})
+        for i in range(rows)
+    )
+    response = await client.post("/contacts/bulk?batch_size=1000", content=body)
+    response.raise_for_status()
+
+
+async def run_scenario(client: httpx.AsyncClient, method: str, path: str, ids: int, concurrency: int, duration: float):
+    done = 0
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal done, errors
+        rnd = random.Random()
+        while time.perf_counter() < deadline:
+            url = path.format(id=rnd.randint(1, ids))
+            body = {"additional_info": f"bench {rnd.random()}"} if method == "PATCH" else None
+            response = await client.request(method, url, json=body)
+            if response.status_code >= 400:
+                errors += 1
+            done += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done / (time.perf_counter() - started), errors
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database-url", help="за замовчуванням — тимчасова SQLite-база")
+    parser.add_argument("--cache", action="store_true", help="не вимикати кеш відповідей")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir.name, 'bench_async.db')}"
+    env = {"DATABASE_URL": database_url, "DB_ASYNC": "1"}
+    if not args.cache:
+        # GET-сценарії мають міряти sync/async доступ до бази, а не кеш
+        env["CACHE_MAX_SIZE"] = "0"
+    server = start_server(args.port, env, args.workers)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=30) as client:
+            await wait_until_ready(client)
+            await seed(client, args.rows)
+            print(f"{'scenario':<30}{'req/s':>10}{'errors':>8}")
+            for name, method, path in SCENARIOS:
+                rps, errors = await run_scenario(client, method, path, args.rows, args.concurrency, args.duration)
+                print(f"{name:<30}{rps:>10.1f}{errors:>8}")
+    finally:
+        server.terminate()
+        server.wait()
+        workdir.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""Латентність пошуку контактів: FTS5-індекс проти наївного ILIKE по трьох колонках.
+
+    python -m benchmarks.bench_search --rows 1000000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app import models, search
+from benchmarks.seed import seed_contacts
+
+QUERIES = ["Ivan", "enko", "olena.mel", "user123456", "Sofiia Moroz", "@example", "zzz"]
+
+
+def naive_search(db, query: str, limit: int):
+    return (
+        db.query(models.Contact)
+        .filter(search._like_filter("%" + search._escape_like(query) + "%"))
+        .order_by(models.Contact.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def measure(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    engine = seed_contacts(f"sqlite:///{os.path.join(workdir.name, 'bench_search.db')}", args.rows)
+
+    db = sessionmaker(bind=engine)()
+    print(f"{'query':<16}{'fts, ms':>12}{'ilike, ms':>12}")
+    for query in QUERIES:
+        fts_ms = measure(lambda: search.search_contacts(db, query, limit=args.limit), args.repeat)
+        naive_ms = measure(lambda: naive_search(db, query, args.limit), args.repeat)
+        print(f"{query:<16}{fts_ms:>12.2f}{naive_ms:>12.2f}")
+    db.close()
+    engine.dispose()
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Серіалізація сторінки списку контактів: ORM + pydantic проти проєкції колонок + orjson.
+
+    python -m benchmarks.bench_serialization --rows 100000 --limits 100 1000 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas, serialization
+from benchmarks.seed import seed_contacts
+
+contact_list_adapter = TypeAdapter(list[schemas.ContactOut])
+SHORT_FIELDS = serialization.parse_fields("first_name,last_name,email")
+
+
+def orm_pydantic(db, limit: int):
+    """Попередній шлях: повні ORM-об'єкти, валідація кожного рядка, дамп через pydantic"""
+    contacts = db.query(models.Contact).order_by(models.Contact.id).limit(limit).all()
+    return contact_list_adapter.dump_json(contact_list_adapter.validate_python(contacts, from_attributes=True))
+
+
+def projection(db, limit: int, fields=serialization.CONTACT_FIELDS):
+    return serialization.dump_rows(fields, crud.get_contact_rows(db, fields, limit=limit))
+
+
+def measure(db, fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+        db.expunge_all()
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--limits", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    engine = seed_contacts(f"sqlite:///{os.path.join(workdir.name, 'bench_serialization.db')}", args.rows)
+
+    db = sessionmaker(bind=engine)()
+    print(f"orjson: {'yes' if serialization.orjson is not None else 'no (json fallback)'}")
+    print(f"{'limit':>8}{'orm+pydantic':>15}{'projection':>13}{'3 fields':>11}{'bytes':>10}{'3f bytes':>10}")
+    for limit in args.limits:
+        orm_ms = measure(db, lambda: orm_pydantic(db, limit), args.repeat)
+        full_ms = measure(db, lambda: projection(db, limit), args.repeat)
+        short_ms = measure(db, lambda: projection(db, limit, SHORT_FIELDS), args.repeat)
+        full_size = len(projection(db, limit))
+        short_size = len(projection(db, limit, SHORT_FIELDS))
+        print(f"{limit:>8}{orm_ms:>15.2f}{full_ms:>13.2f}{short_ms:>11.2f}{full_size:>10}{short_size:>10}")
+    db.close()
+    engine.dispose()
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+import math
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.scenarios import SCENARIOS, Context
+
+
+def percentile(values, q: float):
+    """Percentile методом найближчого рангу (values — відсортовані)"""
+    if not values:
+        return None
+    index = max(0, math.ceil(q / 100 * len(values)) - 1)
+    return values[index]
+
+
+def summarize(latencies, errors: int, elapsed: float):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 3) if latencies else None,
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario, ctx: Context, requests: int, concurrency: int):
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, path, kwargs = scenario.request(ctx)
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            await response.aread()
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            if scenario.on_response:
+                scenario.on_response(ctx, response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_all(client: httpx.AsyncClient, rows: int, requests: int, concurrency: int, only=None, log=print):
+    ctx = Context(rows)
+    results = {}
+    for scenario in SCENARIOS:
+        if only and scenario.name not in only:
+            continue
+        results[scenario.name] = await run_scenario(client, scenario, ctx, requests, concurrency)
+        stats = results[scenario.name]
+        log(f"{scenario.name:<20}{stats['rps']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+            f"{stats['p99_ms']:>10}{stats['errors']:>8}")
+    return results
+
+
+def asgi_client():
+    """Клієнт до застосунку в тому ж процесі (без мережі); DATABASE_URL має бути задано до імпорту"""
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+
+
+def start_server(port: int, env: dict, workers: int = 1):
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=dict(os.environ, **env),
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, attempts: int = 100):
+    for _ in range(attempts):
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
@@ -0,0 +1,86 @@
+import itertools
+import json
+import random
+from types import SimpleNamespace
+
+from app import pagination
+
+
+class Context:
+    """Спільний стан сценаріїв: розмір бази, лічильник унікальних email, id створених контактів"""
+
+    def __init__(self, rows: int, seed: int = 7):
+        self.rows = rows
+        self.rnd = random.Random(seed)
+        self.counter = itertools.count()
+        self.created = []
+
+    def random_id(self):
+        return self.rnd.randint(1, self.rows)
+
+    def unique(self):
+        return next(self.counter)
+
+    def contact(self, prefix: str):
+        n = self.unique()
+        return {
+            "first_name": "Bench",
+            "last_name": f"{prefix.title()}{n}",
+            "email": f"bench.{prefix}.{n}.{self.rnd.randrange(10 ** 9)}@example.com",
+            "birthday": "1990-06-15",
+        }
+
+
+class Scenario:
+    def __init__(self, name: str, method: str, path, body=None, content=None, on_response=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.content = content
+        self.on_response = on_response
+
+    def request(self, ctx: Context):
+        kwargs = {}
+        if self.body:
+            kwargs["json"] = self.body(ctx)
+        if self.content:
+            kwargs["content"] = self.content(ctx)
+        return self.method, self.path(ctx), kwargs
+
+
+def _deep_cursor(ctx: Context):
+    return pagination.encode_cursor("id", SimpleNamespace(id=max(ctx.rows - 100, 0)))
+
+
+def _remember_created(ctx: Context, response):
+    if response.status_code == 200:
+        ctx.created.append(response.json()["id"])
+
+
+def _bulk_body(ctx: Context):
+    return "\n".join(json.dumps(ctx.contact("bulk")) for _ in range(100))
+
+
+# Порядок важливий: delete видаляє контакти, створені в create
+SCENARIOS = [
+    Scenario("root", "GET", lambda ctx: "/"),
+    Scenario("healthchecker", "GET", lambda ctx: "/api/healthchecker"),
+    Scenario("get_contact", "GET", lambda ctx: f"/contacts/{ctx.random_id()}"),
+    Scenario("list", "GET", lambda ctx: "/contacts/?limit=20"),
+    Scenario("list_deep_offset", "GET", lambda ctx: f"/contacts/?skip={max(ctx.rows - 100, 0)}&limit=20"),
+    Scenario("list_1000", "GET", lambda ctx: "/contacts/?limit=1000&skip=" + str(ctx.rnd.randrange(ctx.rows))),
+    Scenario("list_1000_fields", "GET",
+             lambda ctx: "/contacts/?limit=1000&fields=first_name,email&skip=" + str(ctx.rnd.randrange(ctx.rows))),
+    Scenario("list_deep_cursor", "GET", lambda ctx: f"/contacts/?limit=20&cursor={_deep_cursor(ctx)}"),
+    Scenario("search", "GET", lambda ctx: f"/contacts/search/?query=user{ctx.random_id()}@"),
+    Scenario("birthdays", "GET", lambda ctx: "/birthdays/?days=7"),
+    Scenario("create", "POST", lambda ctx: "/contacts/", body=lambda ctx: ctx.contact("create"),
+             on_response=_remember_created),
+    Scenario("put", "PUT", lambda ctx: f"/contacts/{ctx.random_id()}", body=lambda ctx: ctx.contact("put")),
+    Scenario("patch", "PATCH", lambda ctx: f"/contacts/{ctx.random_id()}",
+             body=lambda ctx: {"additional_info": f"patched {ctx.unique()}"}),
+    Scenario("delete", "DELETE", lambda ctx: f"/contacts/{ctx.created.pop() if ctx.created else 0}"),
+    Scenario("bulk_100", "POST", lambda ctx: "/contacts/bulk", content=_bulk_body),
+    Scenario("metrics", "GET", lambda ctx: "/metrics"),
+]